@@ -1,5 +1,8 @@
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import pandas as pd
+import asyncio
 import logging
 from pvlib.location import Location
 from irradiance_synth import IrradianceDataset
@@ -11,14 +14,96 @@ DATASETS_PATH = Path('datasets')
 def _find_prefixed_dat_files(prefix):
     return list(DATASETS_PATH.glob(f"{prefix}_*.dat"))
 
+def _read_dat_file(path):
+    return pd.read_csv(path, index_col='Time', parse_dates=True)
+
+def _read_prefixed_dat_files(prefix):
+    return pd.concat([_read_dat_file(path) for path in _find_prefixed_dat_files(prefix)]).sort_index()
+
+async def _read_prefixed_dat_files_async(prefix, executor, progress=None):
+    """
+    Parse each of the yearly `.dat` files for a station in the executor,
+    concurrently. `progress`, if given, is called as
+    `progress(path, n_done, n_total)` as each file finishes.
+    """
+    loop = asyncio.get_running_loop()
+    paths = _find_prefixed_dat_files(prefix)
+    n_done = 0
+
+    async def read(path):
+        nonlocal n_done
+        df = await loop.run_in_executor(executor, _read_dat_file, path)
+        n_done += 1
+        if progress is not None:
+            progress(path, n_done, len(paths))
+        return df
+
+    frames = await _gather_or_cancel([read(path) for path in paths])
+    return pd.concat(frames).sort_index()
+
+async def _gather_or_cancel(coros):
+    """
+    Like `asyncio.gather`, but if any of the coroutines fails (or the caller
+    is cancelled), the others are cancelled rather than left running.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    if not tasks:
+        return []
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # let the cancelled tasks unwind before reporting the failure
+        # (or passing on the caller's cancellation)
+        await asyncio.wait(tasks)
+    for task in tasks:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+    return [task.result() for task in tasks]
+
+class _DefaultProcessPool(ProcessPoolExecutor):
+    """
+    The pool created when no executor is given, so that whole-loader jobs
+    can tell it apart from one the caller chose (see `_run_loader_async`).
+    """
+
+@contextmanager
+def _default_executor(executor):
+    """
+    Use the given executor, or a `ProcessPoolExecutor` for the duration of
+    the load. `read_csv` holds the GIL for much of its parsing, so threads
+    give little real concurrency.
+    """
+    if executor is not None:
+        yield executor
+        return
+    executor = _DefaultProcessPool()
+    try:
+        yield executor
+    finally:
+        # don't block the event loop on reads that were cancelled mid-parse
+        executor.shutdown(wait=False)
+
+def _load_5s(prefix, from_frame):
+    return from_frame(_read_prefixed_dat_files(prefix))
+
+async def _load_5s_async(prefix, from_frame, executor=None, progress=None):
+    with _default_executor(executor) as executor:
+        df = await _read_prefixed_dat_files_async(prefix, executor, progress=progress)
+    return from_frame(df)
+
 def load_alice_5s():
-    log.info("Reading Alice Springs 5-second irradiance file...")
+    log.info("Reading Alice Springs 5-second irradiance files...")
+    return _load_5s("ASP", _alice_5s_from_frame)
+
+async def load_alice_5s_async(executor=None, progress=None):
+    log.info("Reading Alice Springs 5-second irradiance files asynchronously...")
+    return await _load_5s_async("ASP", _alice_5s_from_frame, executor=executor, progress=progress)
+
+def _alice_5s_from_frame(df):
     loc = Location(-23.7624, 133.8754, altitude=580.0, tz="Australia/Darwin", name='Alice Springs')
-    df = pd.concat([
-        pd.read_csv(_find_prefixed_dat_files("ASP"),
-            index_col='Time', parse_dates=True
-        )
-    ])[['GHI', 'DNI']].asfreq('5S')
+    df = df[['GHI', 'DNI']].asfreq('5S')
     df.index = df.index.tz_localize(loc.tz)
     df.columns = ['ghi', 'dni']
     return IrradianceDataset(df, location=loc)
@@ -35,26 +120,36 @@ def load_alice_5m():
     df = df.asfreq('5T')
     return IrradianceDataset(df, location=loc)
 
+async def load_alice_5m_async(executor=None, progress=None):
+    return await _run_loader_async(load_alice_5m, DATASETS_PATH / '101-Site_DKA-WeatherStation.csv.gz',
+        executor=executor, progress=progress)
+
 def load_darwin_5s():
-    log.info("Reading Darwin 5-second irradiance file...")
+    log.info("Reading Darwin 5-second irradiance files...")
+    return _load_5s("DRW", _darwin_5s_from_frame)
+
+async def load_darwin_5s_async(executor=None, progress=None):
+    log.info("Reading Darwin 5-second irradiance files asynchronously...")
+    return await _load_5s_async("DRW", _darwin_5s_from_frame, executor=executor, progress=progress)
+
+def _darwin_5s_from_frame(df):
     loc = Location(-12.4417, 130.9215, altitude=10.0, tz="Australia/Darwin", name='Darwin')
-    df = pd.concat([
-        pd.read_csv(_find_prefixed_dat_files("DRW"),
-            index_col='Time', parse_dates=True
-        )
-    ])[['GHI', 'DNI']].asfreq('5S')
+    df = df[['GHI', 'DNI']].asfreq('5S')
     df.index = df.index.tz_localize(loc.tz)
-    df.columns = ['ghi']
+    df.columns = ['ghi', 'dni']
     return IrradianceDataset(df, location=loc)
 
 def load_katherine_5s():
-    log.info("Reading Katherine 5-second irradiance file...")
+    log.info("Reading Katherine 5-second irradiance files...")
+    return _load_5s("KTR", _katherine_5s_from_frame)
+
+async def load_katherine_5s_async(executor=None, progress=None):
+    log.info("Reading Katherine 5-second irradiance files asynchronously...")
+    return await _load_5s_async("KTR", _katherine_5s_from_frame, executor=executor, progress=progress)
+
+def _katherine_5s_from_frame(df):
     loc = Location(-14.4747, 132.3050, altitude=108.0, tz="Australia/Darwin", name='Katherine')
-    df = pd.concat([
-        pd.read_csv(_find_prefixed_dat_files("KTR"),
-            index_col='Time', parse_dates=True
-        )
-    ])[['GHI', 'DNI']].asfreq('5S')
+    df = df[['GHI', 'DNI']].asfreq('5S')
     df.index = df.index.tz_localize(loc.tz)
     df.columns = ['ghi', 'dni']
     return IrradianceDataset(df, location=loc)
@@ -100,4 +195,77 @@ def load_hawaii_3s():
     if not (DATASETS_PATH / 'hawaii_3s.h5').exists():
         create_hawaii_3s_hdf()
     return load_hawaii_3s_hdf()
+
+async def load_hawaii_3s_async(executor=None, progress=None):
+    """
+    Note that `load_hawaii_3s()` runs as a single executor job, including
+    the (up to 10 minute) HDF build on first use. `progress` is only called
+    once, when it finishes, and it can't be cancelled once started.
+    """
+    path = DATASETS_PATH / 'hawaii_3s.h5'
+    if not path.exists():
+        path = DATASETS_PATH / 'hawaii_3s'
+    return await _run_loader_async(load_hawaii_3s, path, executor=executor, progress=progress)
+
+async def _run_loader_async(loader, path, executor=None, progress=None):
+    """
+    Run a whole loader as one executor job, reporting it to `progress`
+    as a single file in the same way as the `.dat` loaders.
+
+    Unless the caller chose an executor, this runs on the loop's default
+    thread pool: a single job gets no parallelism from a process, and the
+    whole dataset would otherwise be pickled back from the worker.
+    """
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, _DefaultProcessPool):
+        executor = None
+    data = await loop.run_in_executor(executor, loader)
+    if progress is not None:
+        progress(path, 1, 1)
+    return data
+
+ASYNC_LOADERS = {
+    'alice_5s': load_alice_5s_async,
+    'alice_5m': load_alice_5m_async,
+    'darwin_5s': load_darwin_5s_async,
+    'katherine_5s': load_katherine_5s_async,
+    'hawaii_3s': load_hawaii_3s_async,
+}
+
+async def load_stations_async(names, executor=None, progress=None):
+    """
+    Load several stations concurrently, returning a dict of
+    `IrradianceDataset` objects keyed by name (see `ASYNC_LOADERS`).
+
+    `progress`, if given, is called as `progress(name, path, n_done, n_total)`
+    as each file finishes. If a station fails, or the awaiting task is
+    cancelled, the other stations are cancelled too and this waits for
+    them to unwind. Reads still queued in the executor are dropped, but a
+    `ProcessPoolExecutor` hands up to `max_workers + 1` reads to its
+    workers early, and those run to the end (their results are discarded).
+
+    By default the `.dat` files are parsed in a shared `ProcessPoolExecutor`,
+    and the single-job loaders (`alice_5m`, `hawaii_3s`) run on a thread;
+    pass `executor` to use your own for both.
+
+    e.g. from a service's startup coroutine:
+
+        data = await datasets.load_stations_async(['alice_5s', 'hawaii_3s'])
+    """
+    names = list(names)
+    unknown = [name for name in names if name not in ASYNC_LOADERS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s) {unknown}, expected one of {list(ASYNC_LOADERS)}")
+
+    def station_progress(name):
+        if progress is None:
+            return None
+        return lambda path, n_done, n_total: progress(name, path, n_done, n_total)
+
+    with _default_executor(executor) as executor:
+        datasets = await _gather_or_cancel([
+            ASYNC_LOADERS[name](executor=executor, progress=station_progress(name))
+            for name in names
+        ])
+    return dict(zip(names, datasets))
         
\ No newline at end of file
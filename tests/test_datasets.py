@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import datasets
+
+
+def _write_dat(path, start, periods):
+    index = pd.date_range(start, periods=periods, freq='5s', name='Time')
+    df = pd.DataFrame({'GHI': range(periods), 'DNI': range(periods)}, index=index)
+    df.to_csv(path)
+
+
+@pytest.fixture
+def dat_files(tmp_path, monkeypatch):
+    # written out of order, so glob order doesn't match time order
+    for prefix in ['ASP', 'DRW', 'KTR']:
+        _write_dat(tmp_path / f'{prefix}_2021.dat', '2021-01-01 00:00:00', 10)
+        _write_dat(tmp_path / f'{prefix}_2020.dat', '2020-12-31 23:59:10', 10)
+    monkeypatch.setattr(datasets, 'DATASETS_PATH', tmp_path)
+    return sorted(tmp_path.glob('ASP_*.dat'))
+
+
+@pytest.fixture
+def alice_5m_file(tmp_path, monkeypatch):
+    index = pd.date_range('2020-01-01', periods=12, freq='5min', name='Timestamp')
+    pd.DataFrame({
+        'DKA.WeatherStation - Global Horizontal Radiation (W/m²)': range(12),
+        'DKA.WeatherStation - Diffuse Horizontal Radiation (W/m²)': range(12),
+    }, index=index).to_csv(tmp_path / '101-Site_DKA-WeatherStation.csv.gz')
+    monkeypatch.setattr(datasets, 'DATASETS_PATH', tmp_path)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize('name', ['alice_5s', 'darwin_5s', 'katherine_5s'])
+def test_5s_async_matches_sync(dat_files, executor, name):
+    expected = getattr(datasets, f'load_{name}')()
+    assert expected.index.is_monotonic_increasing
+    assert list(expected.columns) == ['ghi', 'dni']
+    assert len(expected) == 20
+
+    load_async = datasets.ASYNC_LOADERS[name]
+    pd.testing.assert_frame_equal(asyncio.run(load_async(executor=executor)), expected)
+    # default ProcessPoolExecutor
+    pd.testing.assert_frame_equal(asyncio.run(load_async()), expected)
+
+
+def test_alice_5m_async_keeps_location(alice_5m_file):
+    expected = datasets.load_alice_5m()
+
+    # default runs on a thread
+    data = asyncio.run(datasets.load_alice_5m_async())
+    pd.testing.assert_frame_equal(data, expected)
+    assert data.location.name == 'Alice Springs'
+
+    # a caller's process pool pickles the whole dataset back; fork so the
+    # worker sees the patched DATASETS_PATH
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('fork')) as executor:
+        data = asyncio.run(datasets.load_alice_5m_async(executor=executor))
+    pd.testing.assert_frame_equal(data, expected)
+    assert data.location.name == 'Alice Springs'
+    assert data.location.tz == expected.location.tz
+
+
+def test_alice_5s_async_progress(dat_files, executor):
+    calls = []
+    asyncio.run(datasets.load_alice_5s_async(
+        executor=executor, progress=lambda *args: calls.append(args)
+    ))
+    assert sorted(path for path, _, _ in calls) == dat_files
+    assert [n_done for _, n_done, _ in calls] == [1, 2]
+    assert all(n_total == 2 for _, _, n_total in calls)
+
+
+def test_load_stations_async(dat_files, executor):
+    calls = []
+    data = asyncio.run(datasets.load_stations_async(
+        ['alice_5s', 'katherine_5s'], executor=executor, progress=lambda *args: calls.append(args)
+    ))
+    assert list(data) == ['alice_5s', 'katherine_5s']
+    pd.testing.assert_frame_equal(data['alice_5s'], datasets.load_alice_5s())
+    pd.testing.assert_frame_equal(data['katherine_5s'], datasets.load_katherine_5s())
+    for name in data:
+        assert [n_done for call_name, _, n_done, _ in calls if call_name == name] == [1, 2]
+
+
+def test_load_stations_async_unknown_name():
+    with pytest.raises(ValueError, match='alice_5s'):
+        asyncio.run(datasets.load_stations_async(['alice_5s', 'nowhere']))
+
+
+def test_load_stations_async_cancels_siblings(monkeypatch, executor):
+    cancelled = []
+
+    async def failing(executor=None, progress=None):
+        raise OSError("unreadable")
+
+    async def slow(executor=None, progress=None):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setitem(datasets.ASYNC_LOADERS, 'failing', failing)
+    monkeypatch.setitem(datasets.ASYNC_LOADERS, 'slow', slow)
+
+    async def load():
+        with pytest.raises(OSError, match='unreadable'):
+            await datasets.load_stations_async(['slow', 'failing'], executor=executor)
+        # cancelled before the failure reaches the caller, not at loop shutdown
+        assert cancelled == [True]
+
+    asyncio.run(load())
+
+
+def test_load_stations_async_drains_on_cancel(monkeypatch, executor):
+    cancelled = []
+
+    async def slow(executor=None, progress=None):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            cancelled.append(True)
+            raise
+
+    monkeypatch.setitem(datasets.ASYNC_LOADERS, 'slow', slow)
+    monkeypatch.setitem(datasets.ASYNC_LOADERS, 'slower', slow)
+
+    async def load():
+        task = asyncio.ensure_future(datasets.load_stations_async(['slow', 'slower'], executor=executor))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled == [True, True]
+
+    asyncio.run(load())